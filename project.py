@@ -1,10 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
+import functools
 import math
+import operator
 import re
 
 # --- Safe eval helpers ---
-# Restricting the functions available in 'eval' is a crucial security measure.
+# Expressions are evaluated by a small parser, never by Python's 'eval';
+# only the names below can be referenced.
 SAFE_FUNCTIONS = {
     'sqrt': math.sqrt,
     'sin': math.sin,
@@ -16,25 +19,187 @@ SAFE_FUNCTIONS = {
     'abs': abs,
 }
 
+# SAFE_FUNCTIONS split once into plain values and callables, so the parser
+# doesn't re-check callable() on every name it meets
+_SAFE_CONSTANTS = {name: v for name, v in SAFE_FUNCTIONS.items() if not callable(v)}
+_SAFE_CALLABLES = {name: v for name, v in SAFE_FUNCTIONS.items() if callable(v)}
+
+# Binary operators, dispatched by token text
+_BINARY_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '//': operator.floordiv,
+    '%': operator.mod,
+    '**': operator.pow,
+}
+
+# Operator groups per precedence level, and characters that make a number literal a float
+_ADDITIVE_OPS = frozenset(('+', '-'))
+_MULTIPLICATIVE_OPS = frozenset(('*', '/', '//', '%'))
+_FLOAT_CHARS = frozenset('.eE')
+
+# One token per match: a number (with optional exponent), a name, or an operator/bracket
+_TOKEN_RE = re.compile(r'\s*(?:(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[a-z]+)|(?P<op>\*\*|//|[+\-*/%(),]))')
+
+# A bare (optionally negative) integer or decimal literal
+_NUMERIC_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Button (background, hover) colors per key; anything not listed is a number key
+_BUTTON_STYLE = {
+    '=': ('#4cd964', '#2e7d32'),  # green / darker green
+    '/': ('#ff9500', '#e67e22'),  # orange / darker orange for primary operators
+    '*': ('#ff9500', '#e67e22'),
+    '-': ('#ff9500', '#e67e22'),
+    '+': ('#ff9500', '#e67e22'),
+    'AC': ('#555555', '#666666'), # secondary function color
+    'C': ('#555555', '#666666'),
+    '+/-': ('#555555', '#666666'),
+    '%': ('#555555', '#666666'),
+}
+_DEFAULT_BUTTON_STYLE = ('#333333', '#444444')
+
+# Characters typed on the keyboard that are passed straight to on_button_click
+_ALLOWED_KEYS = frozenset('0123456789.+-*/()%')
+
+# Last number in an expression, optionally preceded by a minus sign (used by '+/-')
+_TRAILING_NUM_RE = re.compile(r'(-?\d*\.?\d+)\Z')
+
+def _tokenize(expr: str):
+    """
+    Split an expression into (kind, text) tokens, rejecting anything unrecognised.
+    """
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m:
+            rest = expr[pos:].lstrip()
+            if not rest:
+                break
+            raise ValueError(f"Invalid character: {rest[0]}")
+        pos = m.end()
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+    return tokens
+
+class _Parser:
+    """
+    Recursive descent evaluator over the calculator grammar, using Python's precedence:
+    expr: term (('+'|'-') term)*
+    term: factor (('*'|'/'|'//'|'%') factor)*
+    factor: ('+'|'-') factor | power
+    power: atom ['**' factor]
+    atom: NUM | NAME | NAME '(' args ')' | '(' expr ')'
+    """
+
+    __slots__ = ('tokens', 'pos')
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][1]
+        return None
+
+    def next(self):
+        if self.pos >= len(self.tokens):
+            raise ValueError("Incomplete expression")
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def expect(self, text):
+        if self.next()[1] != text:
+            raise ValueError(f"Expected '{text}'")
+
+    def parse(self):
+        value = self.parse_expr()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected token: {self.peek()}")
+        return value
+
+    def parse_expr(self):
+        value = self.parse_term()
+        while self.peek() in _ADDITIVE_OPS:
+            op = self.next()[1]
+            value = _BINARY_OPS[op](value, self.parse_term())
+        return value
+
+    def parse_term(self):
+        value = self.parse_factor()
+        while self.peek() in _MULTIPLICATIVE_OPS:
+            op = self.next()[1]
+            value = _BINARY_OPS[op](value, self.parse_factor())
+        return value
+
+    def parse_factor(self):
+        if self.peek() in _ADDITIVE_OPS:
+            op = self.next()[1]
+            value = self.parse_factor()
+            return -value if op == '-' else +value
+        return self.parse_power()
+
+    def parse_power(self):
+        base = self.parse_atom()
+        if self.peek() == '**':
+            self.next()
+            # right-associative, and binds tighter than a unary minus on its left
+            return _BINARY_OPS['**'](base, self.parse_factor())
+        return base
+
+    def parse_atom(self):
+        kind, text = self.next()
+        if kind == 'num':
+            return int(text) if _FLOAT_CHARS.isdisjoint(text) else float(text)
+        if kind == 'name':
+            value = _SAFE_CONSTANTS.get(text)
+            if value is not None:
+                return value
+            func = _SAFE_CALLABLES.get(text)
+            if func is None:
+                raise ValueError(f"Unknown name: {text}")
+            self.expect('(')
+            args = []
+            if self.peek() != ')':
+                args.append(self.parse_expr())
+                while self.peek() == ',':
+                    self.next()
+                    args.append(self.parse_expr())
+            self.expect(')')
+            return func(*args)
+        if text == '(':
+            value = self.parse_expr()
+            self.expect(')')
+            return value
+        raise ValueError(f"Unexpected token: {text}")
+
+@functools.lru_cache(maxsize=128)
 def safe_eval(expr: str):
     """
-    Evaluate a math expression safely by limiting globals.
+    Evaluate a math expression safely without using Python's eval.
     Allows numbers, basic arithmetic operators, and functions from SAFE_FUNCTIONS.
+    Results are memoized: every allowed function is pure, so the expression alone determines the value.
     """
-    # Simple check for allowed characters (slightly relaxed, relying heavily on restricted eval scope)
-    allowed_chars = "0123456789+-*/(). %e"
-    for ch in expr:
-        if ch.isalpha() and ch not in 'sincotapewabsr': # Check against letters in allowed functions
-            raise ValueError("Invalid character found in expression")
-        if ch.isalpha() or ch.isspace():
-            continue
-        if ch not in allowed_chars:
-            raise ValueError(f"Invalid character: {ch}")
-
-    # Evaluate with SAFE_FUNCTIONS as allowed globals and an empty dictionary for locals
-    return eval(expr, {**SAFE_FUNCTIONS}, {})
+    # Bare numbers (e.g. the previous result) don't need parsing at all
+    s = expr.strip()
+    if _NUMERIC_RE.fullmatch(s):
+        return float(s) if '.' in s else int(s)
+
+    return _Parser(_tokenize(expr)).parse()
 
 class ModernCalculator(tk.Tk):
+    # Fixed attribute slots for the state read on every keystroke. tk.Tk already
+    # provides a __dict__ for Tk internals, so only our own attributes are listed.
+    __slots__ = (
+        '_chars', 'expr_var', 'result_var',
+        'bg', 'panel_bg', 'btn_fg', 'disp_font', 'btn_font',
+        'btn_layout', 'btn_canvas', '_button_rects', '_btn_items', '_cell_w', '_cell_h', '_hover_key',
+        '_pending_expr', '_pending_flush',
+    )
+
     # Fix 1: Corrected constructor name from 'init' to '__init__'
     def __init__(self):
         super().__init__()
@@ -50,15 +215,18 @@ class ModernCalculator(tk.Tk):
         # fonts & colors
         self.bg = "#2b2b2b"
         self.panel_bg = "#1f1f1f"
-        self.btn_bg = "#333333"
         self.btn_fg = "#ffffff"
-        self.op_bg = "#ff9500" # Orange for primary operators
-        self.accent = "#4cd964" # Green for '=' button
         self.disp_font = ("Segoe UI", 24)
         self.btn_font = ("Segoe UI", 14, "bold")
 
-        # expression
-        self.expression = ""
+        # expression, kept as a list of characters so appends don't copy the whole string
+        self._chars = []
+
+        # pending text for the expression label, flushed once per idle cycle
+        # (None means "show the current expression")
+        self._pending_expr = None
+        self._pending_flush = False
+
         self.create_ui()
         self.bind_keys()
 
@@ -82,12 +250,8 @@ class ModernCalculator(tk.Tk):
                                 fg=self.btn_fg, font=self.disp_font)
         result_label.pack(fill='both', padx=12, pady=(0, 12))
 
-        # buttons frame
-        btns = tk.Frame(self, bg=self.bg)
-        btns.place(relx=0.05, rely=0.35, relwidth=0.9, relheight=0.6)
-
         # layout buttons in grid
-        btn_layout = [
+        self.btn_layout = [
             ['AC', 'C', '%', '/'],
             ['7', '8', '9', '*'],
             ['4', '5', '6', '-'],
@@ -95,83 +259,144 @@ class ModernCalculator(tk.Tk):
             ['+/-', '0', '.', '=']
         ]
 
-        for r, row in enumerate(btn_layout):
-            for c, key in enumerate(row):
-                is_op = key in ['/', '*', '-', '+', '=']
-                # Determine background color
-                if key == '=':
-                    bg = self.accent
-                elif key in ['AC', 'C', '+/-', '%']:
-                    bg = '#555555' # Secondary function color
-                elif is_op:
-                    bg = self.op_bg
-                else:
-                    bg = self.btn_bg
-                
-                # Determine foreground color (all white/light grey for contrast)
-                fg = self.btn_fg
-
-                btn = tk.Label(btns, text=key, bg=bg, fg=fg, font=self.btn_font, bd=0,
-                               relief='flat', cursor="hand2")
-                btn.grid(row=r, column=c, sticky='nsew', padx=5, pady=5) # Reduced padding for compact look
-
-                # make grid cells expand evenly
-                btns.grid_rowconfigure(r, weight=1)
-                btns.grid_columnconfigure(c, weight=1)
-
-                # bindings
-                btn.bind('<Button-1>', lambda e, k=key: self.on_button_click(k))
-                btn.bind('<Enter>', lambda e, w=btn: w.configure(bg=self.hover_color(w)))
-                btn.bind('<Leave>', lambda e, w=btn, key=key: w.configure(bg=self.reset_color(key)))
+        # all buttons are drawn on one canvas instead of one widget per key;
+        # clicks and hover are resolved by hit-testing the pointer position
+        self._button_rects = [] # (x0, y0, x1, y1, key) in row-major order
+        self._btn_items = {}    # key -> rectangle item id
+        self._cell_w = self._cell_h = 0
+        self._hover_key = None
+
+        self.btn_canvas = tk.Canvas(self, bg=self.bg, bd=0, highlightthickness=0)
+        self.btn_canvas.place(relx=0.05, rely=0.35, relwidth=0.9, relheight=0.6)
+
+        # bindings
+        self.btn_canvas.bind('<Configure>', self._draw_buttons)
+        self.btn_canvas.bind('<Button-1>', self._on_press)
+        self.btn_canvas.bind('<Motion>', self._on_motion)
+        self.btn_canvas.bind('<Leave>', self._on_leave)
 
         # small footer
         footer = tk.Label(self, text='Designed by Dhruv Verma • Safe eval for basic math',
                           bg=self.bg, fg='#888', font=("Segoe UI", 8))
         footer.place(relx=0.05, rely=0.94, relwidth=0.9)
 
-    def hover_color(self, widget):
-        cur = widget.cget('text')
-        if cur == '=':
-            return '#2e7d32' # darker green
-        if cur in ['/', '*', '-', '+']:
-            return '#e67e22' # darker orange
-        if cur in ['AC', 'C', '+/-', '%']:
-            return '#666666'
-        return '#444444' # darker number color
-
-    def reset_color(self, key):
-        if key == '=':
-            return self.accent
-        if key in ['/', '*', '-', '+']:
-            return self.op_bg
-        if key in ['AC', 'C', '+/-', '%']:
-            return '#555555'
-        return self.btn_bg
+    def _draw_buttons(self, event):
+        canvas = self.btn_canvas
+        canvas.delete('all')
+
+        rows, cols = len(self.btn_layout), len(self.btn_layout[0])
+        self._cell_w = event.width / cols
+        self._cell_h = event.height / rows
+        self._button_rects = []
+        self._btn_items = {}
+        self._hover_key = None
+        pad = 5 # Reduced padding for compact look
+
+        for r, row in enumerate(self.btn_layout):
+            for c, key in enumerate(row):
+                x0 = c * self._cell_w + pad
+                y0 = r * self._cell_h + pad
+                x1 = (c + 1) * self._cell_w - pad
+                y1 = (r + 1) * self._cell_h - pad
+                bg, _ = _BUTTON_STYLE.get(key, _DEFAULT_BUTTON_STYLE)
+
+                rect = canvas.create_rectangle(x0, y0, x1, y1, fill=bg, outline='')
+                # all labels white/light grey for contrast
+                canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=key,
+                                   fill=self.btn_fg, font=self.btn_font)
+
+                self._button_rects.append((x0, y0, x1, y1, key))
+                self._btn_items[key] = rect
+
+    def _hit_test(self, x, y):
+        # map pointer coordinates to the key under it, or None for gaps/outside
+        if not self._button_rects:
+            return None
+        cols = len(self.btn_layout[0])
+        col = int(x // self._cell_w)
+        row = int(y // self._cell_h)
+        if not (0 <= row < len(self.btn_layout) and 0 <= col < cols):
+            return None
+        x0, y0, x1, y1, key = self._button_rects[row * cols + col]
+        if x0 <= x <= x1 and y0 <= y <= y1:
+            return key
+        return None
+
+    def _set_hover(self, key):
+        # repaint only the button leaving hover and the one entering it
+        canvas = self.btn_canvas
+        old = self._hover_key
+        if old is not None:
+            canvas.itemconfigure(self._btn_items[old], fill=_BUTTON_STYLE.get(old, _DEFAULT_BUTTON_STYLE)[0])
+        if key is not None:
+            canvas.itemconfigure(self._btn_items[key], fill=_BUTTON_STYLE.get(key, _DEFAULT_BUTTON_STYLE)[1])
+        canvas.configure(cursor="hand2" if key is not None else '')
+        self._hover_key = key
+
+    def _on_press(self, event):
+        key = self._hit_test(event.x, event.y)
+        if key is not None:
+            self.on_button_click(key)
+
+    def _on_motion(self, event):
+        key = self._hit_test(event.x, event.y)
+        if key != self._hover_key:
+            self._set_hover(key)
+
+    def _on_leave(self, event):
+        self._set_hover(None)
 
     def bind_keys(self):
-        # Bind number and operator keys
-        for char in '0123456789.+-*/()%':
-            self.bind(char, self.on_key)
+        # Bind number and operator keys (one catch-all binding, filtered in on_key)
+        self.bind('<Key>', self.on_key)
         # Bind commands
         self.bind('<Return>', lambda e: self.on_button_click('='))
         self.bind('<BackSpace>', lambda e: self.on_button_click('C'))
         self.bind('<Escape>', lambda e: self.on_button_click('AC'))
 
     def on_key(self, event):
-        self.on_button_click(event.char)
+        if event.char in _ALLOWED_KEYS:
+            self.on_button_click(event.char)
+
+    @property
+    def expression(self):
+        return ''.join(self._chars)
+
+    @expression.setter
+    def expression(self, value):
+        self._chars[:] = value
+
+    def _queue_display(self, text=None):
+        # coalesce bursts of keystrokes into a single StringVar update / redraw
+        self._pending_expr = text
+        if not self._pending_flush:
+            self._pending_flush = True
+            self.after_idle(self._flush_display)
+
+    def _flush_display(self):
+        text = self._pending_expr
+        self.expr_var.set(self.expression if text is None else text)
+        self._pending_flush = False
+
+    def _pin_display(self):
+        # a deferred update shows the expression as it is at flush time; fix it to the
+        # current text so clearing the expression on error doesn't blank the label
+        if self._pending_flush and self._pending_expr is None:
+            self._pending_expr = self.expression
 
     def on_button_click(self, key):
         try:
             if key == 'AC':
-                self.expression = ''
+                self._chars.clear()
                 self.result_var.set('')
-                self.expr_var.set('')
+                self._queue_display()
                 return
 
             if key == 'C':
                 # backspace
-                self.expression = self.expression[:-1]
-                self.expr_var.set(self.expression)
+                if self._chars:
+                    self._chars.pop()
+                self._queue_display()
                 return
 
             if key == '+/-':
@@ -181,15 +406,17 @@ class ModernCalculator(tk.Tk):
 
             if key == '%':
                 # percent: divide current number by 100 (attempts to evaluate current expression)
-                if not self.expression.strip():
+                expr = self.expression.strip()
+                if not expr:
                     return
                 try:
-                    val = safe_eval(self.expression)
+                    # a bare number (e.g. right after '=') is divided directly, no evaluation needed
+                    val = float(expr) if _NUMERIC_RE.fullmatch(expr) else safe_eval(expr)
                     val = val / 100
                     # For simplicity, we restart the expression with the calculated percentage value
                     self.expression = str(val)
-                    self.expr_var.set(self.expression)
-                    self.result_var.set(self.expression)
+                    self._queue_display()
+                    self.result_var.set(str(val))
                 except Exception:
                     self.result_var.set('Error')
                 return
@@ -201,34 +428,39 @@ class ModernCalculator(tk.Tk):
                     return
                 try:
                     result = safe_eval(self.expression)
-                    
-                    # format: drop .0 for integers
-                    if isinstance(result, float) and result.is_integer():
+
+                    # display: '.12g' rounds to 12 significant digits, trimming float noise in one call
+                    # (values of 1e12 and up, or very small ones, switch to exponent form)
+                    self.result_var.set(format(result, '.12g') if type(result) is float else str(result))
+                    self._queue_display(self.expression + ' =')
+
+                    # Start new calculations from the full-precision result (drop .0 for integers)
+                    if type(result) is float and result.is_integer():
                         result = int(result)
-                    
-                    self.result_var.set(str(result))
-                    self.expr_var.set(self.expression + ' =')
-                    self.expression = str(result) # Start new calculations from the result
+                    self.expression = str(result)
                 except Exception as e:
                     print(f"Evaluation error: {e}")
                     self.result_var.set('Error')
+                    self._pin_display()
                     self.expression = '' # Reset expression on error
                 return
 
             # otherwise append key
-            self.expression += str(key)
-            self.expr_var.set(self.expression)
+            self._chars.append(str(key))
+            self._queue_display()
             
         except Exception as e:
             # Catch errors in the button click logic itself (not evaluation)
             print(f"UI Error: {e}")
             self.result_var.set('Error')
+            self._pin_display()
             self.expression = ''
 
     def toggle_sign(self):
         # find last number in the expression and toggle its sign
         # Looks for any floating point or integer number at the end, optionally preceded by a minus sign
-        m = re.search(r'(-?\d*\.?\d+)$', self.expression)
+        expr = self.expression
+        m = _TRAILING_NUM_RE.search(expr)
         if not m:
             return
         
@@ -240,8 +472,8 @@ class ModernCalculator(tk.Tk):
         else:
             new = '-' + num
             
-        self.expression = self.expression[:start] + new
-        self.expr_var.set(self.expression)
+        self.expression = expr[:start] + new
+        self._queue_display()
 
 # Fix 3: Corrected main execution block name from 'name == ' main '' to '__name__ == '__main__''
 if __name__ == '__main__':